@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from ..db import get_db
@@ -8,7 +8,7 @@ from ..schemas import (
     AviationstackManualCreate,
     AviationstackManualResult,
 )
-from ..services import flights_service
+from ..services import aviationstack_cache, flights_service
 
 router = APIRouter(prefix="/flights", tags=["flights"])
 flight_number = 2000
@@ -31,9 +31,16 @@ async def import_aviationstack(
     "/aviationstack/{airport}", response_model=AviationstackAirportResponse
 )
 async def get_aviationstack_airport(
-    airport: str, limit: int = Query(default=2000, ge=1, le=3000)
+    airport: str,
+    response: Response,
+    limit: int = Query(default=2000, ge=1, le=3000),
 ) -> dict:
-    return flights_service.fetch_aviationstack_airport(airport, flight_number)
+    payload, cache_state, age = await aviationstack_cache.get_airport(
+        airport, flight_number
+    )
+    response.headers["X-Cache"] = cache_state
+    response.headers["Age"] = str(age)
+    return payload
 
 
 @router.get("/{airport}", response_model=AviationstackAirportResponse)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from . import flights_service
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = "HIT"
+CACHE_STALE = "STALE"
+CACHE_MISS = "MISS"
+
+
+@dataclass
+class _CacheEntry:
+    payload: dict
+    fetched_at: float
+    last_attempt: float
+
+
+_entries: dict[tuple[str, int], _CacheEntry] = {}
+_inflight: dict[tuple[str, int], asyncio.Task] = {}
+
+
+def _fresh_seconds() -> float:
+    return float(os.getenv("AVIATIONSTACK_CACHE_TTL_SECONDS", "300"))
+
+
+def _stale_seconds() -> float:
+    return float(os.getenv("AVIATIONSTACK_CACHE_STALE_SECONDS", "3600"))
+
+
+async def _refresh(key: tuple[str, int]) -> dict:
+    airport, limit = key
+    try:
+        payload = await asyncio.to_thread(
+            flights_service.fetch_aviationstack_airport, airport, limit
+        )
+    except Exception:
+        entry = _entries.get(key)
+        if entry:
+            entry.last_attempt = time.monotonic()
+        raise
+    now = time.monotonic()
+    _entries[key] = _CacheEntry(payload=payload, fetched_at=now, last_attempt=now)
+    return payload
+
+
+def _on_refresh_done(key: tuple[str, int], task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.exception(
+            "Aviationstack refresh failed for %s", key[0], exc_info=exc
+        )
+
+
+def _start_refresh(key: tuple[str, int]) -> asyncio.Task:
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_refresh(key))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _on_refresh_done(key, done))
+    return task
+
+
+async def get_airport(airport: str, limit: int) -> tuple[dict, str, int]:
+    """Return ``(payload, cache_state, age_seconds)`` for an airport board.
+
+    Fresh entries are served as-is. Entries past the freshness TTL but inside
+    the stale window are served immediately while a single background refresh
+    runs; after a failed refresh, the next one waits for the freshness TTL.
+    Expired entries are dropped, and misses wait on the upstream call, shared
+    by all concurrent callers.
+    """
+    key = (airport.strip().upper(), limit)
+    entry = _entries.get(key)
+    if entry:
+        now = time.monotonic()
+        age = now - entry.fetched_at
+        fresh = _fresh_seconds()
+        if age < fresh:
+            return entry.payload, CACHE_HIT, int(age)
+        if age < fresh + _stale_seconds():
+            # Back off after a failed refresh instead of retrying upstream
+            # on every stale read.
+            if now - entry.last_attempt >= fresh:
+                _start_refresh(key)
+            return entry.payload, CACHE_STALE, int(age)
+        del _entries[key]
+
+    # Shield the shared task so one disconnecting client does not cancel
+    # the upstream call for everyone else waiting on it.
+    payload = await asyncio.shield(_start_refresh(key))
+    return payload, CACHE_MISS, 0
+
+
+def clear() -> None:
+    _entries.clear()
+    _inflight.clear()
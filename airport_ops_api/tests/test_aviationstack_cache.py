@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.fixture()
+def upstream(monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    calls = []
+
+    def fake_fetch(airport: str, limit: int) -> dict:
+        calls.append(airport)
+        return {"airport": airport, "departures": [], "arrivals": []}
+
+    monkeypatch.setattr(flights_service, "fetch_aviationstack_airport", fake_fetch)
+    aviationstack_cache.clear()
+    yield calls
+    aviationstack_cache.clear()
+
+
+def test_aviationstack_cache_hit_after_miss(client, upstream):
+    first = client.get("/flights/aviationstack/ord")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.json()["airport"] == "ORD"
+
+    second = client.get("/flights/aviationstack/ORD")
+    assert second.status_code == 200
+    assert second.headers["X-Cache"] == "HIT"
+    assert "Age" in second.headers
+    assert upstream == ["ORD"]
+
+
+def test_aviationstack_cache_serves_stale_and_refreshes(client, upstream, monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    monkeypatch.setenv("AVIATIONSTACK_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("AVIATIONSTACK_CACHE_STALE_SECONDS", "3600")
+    assert client.get("/flights/aviationstack/ORD").headers["X-Cache"] == "MISS"
+
+    release = threading.Event()
+    flight = {
+        "flight_number": "AA101",
+        "airline": "American Airlines",
+        "status": "scheduled",
+        "origin": "ORD",
+        "destination": "LAX",
+    }
+
+    def slow_fetch(airport: str, limit: int) -> dict:
+        upstream.append(airport)
+        release.wait(timeout=5)
+        return {"airport": airport, "departures": [flight], "arrivals": []}
+
+    monkeypatch.setattr(flights_service, "fetch_aviationstack_airport", slow_fetch)
+
+    for _ in range(3):
+        stale = client.get("/flights/aviationstack/ORD")
+        assert stale.status_code == 200
+        assert stale.headers["X-Cache"] == "STALE"
+        assert stale.json()["departures"] == []
+    assert upstream == ["ORD", "ORD"]
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while aviationstack_cache._inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    monkeypatch.setenv("AVIATIONSTACK_CACHE_TTL_SECONDS", "300")
+    fresh = client.get("/flights/aviationstack/ORD")
+    assert fresh.headers["X-Cache"] == "HIT"
+    assert fresh.json()["departures"][0]["flight_number"] == "AA101"
+    assert upstream == ["ORD", "ORD"]
+
+
+def test_aviationstack_cache_backs_off_after_failed_refresh(upstream, monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    async def run() -> list:
+        await aviationstack_cache.get_airport("ORD", 10)
+        entry = aviationstack_cache._entries[("ORD", 10)]
+        entry.fetched_at -= 400
+        entry.last_attempt -= 400
+
+        def failing_fetch(airport: str, limit: int) -> dict:
+            upstream.append(airport)
+            raise HTTPException(status_code=400, detail="quota")
+
+        monkeypatch.setattr(
+            flights_service, "fetch_aviationstack_airport", failing_fetch
+        )
+        states = []
+        for _ in range(5):
+            _, state, _ = await aviationstack_cache.get_airport("ORD", 10)
+            states.append(state)
+            await asyncio.sleep(0.02)
+        return states
+
+    assert asyncio.run(run()) == ["STALE"] * 5
+    assert upstream == ["ORD", "ORD"]
+
+
+def test_aviationstack_cache_drops_expired_entries(upstream, monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    monkeypatch.setenv("AVIATIONSTACK_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("AVIATIONSTACK_CACHE_STALE_SECONDS", "0")
+
+    def failing_fetch(airport: str, limit: int) -> dict:
+        raise HTTPException(status_code=400, detail="quota")
+
+    async def run() -> None:
+        await aviationstack_cache.get_airport("XYZ", 10)
+        monkeypatch.setattr(
+            flights_service, "fetch_aviationstack_airport", failing_fetch
+        )
+        with pytest.raises(HTTPException):
+            await aviationstack_cache.get_airport("XYZ", 10)
+
+    asyncio.run(run())
+    assert aviationstack_cache._entries == {}
+
+
+def test_aviationstack_cache_coalesces_concurrent_misses(upstream, monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    release = threading.Event()
+
+    def slow_fetch(airport: str, limit: int) -> dict:
+        upstream.append(airport)
+        release.wait(timeout=5)
+        return {"airport": airport, "departures": [], "arrivals": []}
+
+    monkeypatch.setattr(flights_service, "fetch_aviationstack_airport", slow_fetch)
+
+    async def run() -> list:
+        waiters = [
+            asyncio.create_task(aviationstack_cache.get_airport("ORD", 10))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(run())
+    assert upstream == ["ORD"]
+    assert all(state == "MISS" for _, state, _ in results)
+
+
+def test_aviationstack_cache_miss_error_reaches_all_waiters(upstream, monkeypatch):
+    from app.services import aviationstack_cache, flights_service
+
+    release = threading.Event()
+
+    def failing_fetch(airport: str, limit: int) -> dict:
+        upstream.append(airport)
+        release.wait(timeout=5)
+        raise HTTPException(status_code=400, detail="quota")
+
+    monkeypatch.setattr(flights_service, "fetch_aviationstack_airport", failing_fetch)
+
+    async def run() -> list:
+        waiters = [
+            asyncio.create_task(aviationstack_cache.get_airport("ORD", 10))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert upstream == ["ORD"]
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert aviationstack_cache._inflight == {}